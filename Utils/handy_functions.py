@@ -26,8 +26,22 @@ def set_seed(value):
     random.seed(value)
     np.random.seed(value)
     torch.manual_seed(value)
-    torch.backends.cudnn.deterministic = True
-    torch.backends.cudnn.benchmark = False
+    set_cudnn_flags()
+
+def set_cudnn_flags():
+    """
+    Configure cuDNN and matmul backends. By default, deterministic
+    cuDNN kernels are used. If the environment variable
+    HINT_CUDNN_BENCHMARK=1 is set, the cuDNN autotuner and TF32 kernels
+    are enabled instead, trading bitwise reproducibility for speed
+    of fixed-shape convolutions.
+    """
+    use_benchmark = os.environ.get("HINT_CUDNN_BENCHMARK", "0") == "1"
+    torch.backends.cudnn.deterministic = not use_benchmark
+    torch.backends.cudnn.benchmark = use_benchmark
+    if use_benchmark:
+        torch.backends.cudnn.allow_tf32 = True
+        torch.backends.cuda.matmul.allow_tf32 = True
 
 def append_row_to_file(filename, elements, header=""):
     """
@@ -616,6 +616,15 @@ def set_hyperparameters(dataset,
     hyperparams["dataset"] = dataset
     hyperparams["device"] = "cuda" if torch.cuda.is_available() else "cpu"
     hyperparams["kappa"] = 0.5
+    # Options of target networks used during the evaluation (inference)
+    hyperparams["use_torch_compile"] = False
+    hyperparams["use_amp"] = False
+    # Generate target weights of all tasks with a single hypernetwork pass
+    # during the entropy evaluation; faster but needs memory for weights
+    # of all tasks at once
+    hyperparams["generate_weights_for_all_tasks"] = False
+    # Replay captured CUDA graphs during the entropy evaluation
+    hyperparams["use_cuda_graphs"] = False
     os.makedirs(hyperparams["saving_folder"], exist_ok=True)
     return hyperparams
 
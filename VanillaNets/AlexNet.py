@@ -1,11 +1,23 @@
+import torch
 import torch.nn as nn
 import torch.nn.functional as F
-import numpy as np
 
 from hypnettorch.mnets.classifier_interface import Classifier
 from hypnettorch.mnets.mnet_interface import MainNetInterface
 
 
+def _conv_block(x, weight, bias, stride=1, pooling=False):
+    """Convolution (with an optional 2x2 max pooling) followed by ReLU.
+
+    It is kept free of Python branches depending on tensors, so that it can
+    be fused into a single kernel chain by :func:`torch.compile`.
+    """
+    h = F.conv2d(x, weight, bias=bias, stride=stride, padding=1)
+    if pooling:
+        h = F.max_pool2d(h, kernel_size=2)
+    return F.relu(h)
+
+
 class AlexNet(Classifier):
     """Implementation of AlexNet to make a fair comparison between
     InterContiNet and HyperInterval results.
@@ -45,6 +57,14 @@ class AlexNet(Classifier):
         If ``True``, then the shapes of the batchnorm statistics will be added to the attribute
             :attr:`mnets.mnet_interface.MainNetInterface.hyper_shapes_distilled` and the current statistics 
             will be returned by the method :meth:`distillation_targets`. Currently it is not used.
+        use_torch_compile: bool
+            If ``True``, convolutional blocks are compiled with :func:`torch.compile`
+            to fuse ReLU and pooling into the convolution epilogue. Ignored when
+            :func:`torch.compile` is not available.
+        use_amp: bool
+            If ``True``, convolutional layers are evaluated in half precision
+            using :func:`torch.autocast` on CUDA devices. Fully-connected layers
+            always work in full precision.
 
     Returns:
     --------
@@ -62,6 +82,8 @@ class AlexNet(Classifier):
         bn_track_stats=True,
         distill_bn_stats=False,
         init_weights=None,
+        use_torch_compile=False,
+        use_amp=False,
     ):
         super(AlexNet, self).__init__(num_classes, verbose)
 
@@ -154,6 +176,12 @@ class AlexNet(Classifier):
             range(len(self._param_shapes))
         )
 
+        self._use_amp = use_amp
+
+        self._conv_block = _conv_block
+        if use_torch_compile and hasattr(torch, "compile"):
+            self._conv_block = torch.compile(_conv_block, dynamic=False)
+
         self._layer_weight_tensors = nn.ParameterList()
         self._layer_bias_vectors = nn.ParameterList()
 
@@ -213,11 +241,12 @@ class AlexNet(Classifier):
 
         if weights is None:
             weights = self._weights
-        else:
+        elif __debug__:
+            # Validation of weight shapes is skipped entirely with `python -O`
             shapes = self.param_shapes
             assert len(weights) == len(shapes)
             for i, s in enumerate(shapes):
-                assert np.all(np.equal(s, list(weights[i].shape)))
+                assert tuple(s) == tuple(weights[i].shape)
 
 
         ######################################
@@ -239,94 +268,95 @@ class AlexNet(Classifier):
         ########################
 
         x = x.view(-1, *self._in_shape)
-        x = x.permute(0, 3, 1, 2)
-
-        ### Convolutional layers
-
-        # First convolutional block + pooling
-        h = F.conv2d(x, weights[0], bias=weights[1], stride=2, padding=1)
-        h = F.max_pool2d(h, kernel_size=2)
-        h = F.relu(h)
-
-        # Batch normalization
-        if self._use_batch_norm:
-            h = self._batchnorm_layers[0].forward(
-                        h,
-                        running_mean=running_means[0],
-                        running_var=running_vars[0],
-                        weight=weights[bn_params_start_idx],
-                        bias=weights[bn_params_start_idx+1],
-                        stats_id=bn_cond,
-                    )
-
-        # Second convolutional block
-        h = F.conv2d(h, weights[2], bias=weights[3], padding=1)
-        h = F.max_pool2d(h, kernel_size=2)
-        h = F.relu(h)
-
-        # Batch normalization
-        if self._use_batch_norm:
-            h = self._batchnorm_layers[1].forward(
-                        h,
-                        running_mean=running_means[1],
-                        running_var=running_vars[1],
-                        weight=weights[bn_params_start_idx+2],
-                        bias=weights[bn_params_start_idx+3],
-                        stats_id=bn_cond,
-                    )
-
-        # Third convolutional block
-        h = F.conv2d(h, weights[4], bias=weights[5], padding=1)
-        h = F.relu(h)
-
-        # Batch normalization
-        if self._use_batch_norm:
-            h = self._batchnorm_layers[2].forward(
-                        h,
-                        running_mean=running_means[2],
-                        running_var=running_vars[2],
-                        weight=weights[bn_params_start_idx+4],
-                        bias=weights[bn_params_start_idx+5],
-                        stats_id=bn_cond,
-                    )
-
-        # Fourth convolutional block
-        h = F.conv2d(h, weights[6], bias=weights[7], padding=1)
-        h = F.relu(h)
-
-        # Batch normalization
-        if self._use_batch_norm:
-            h = self._batchnorm_layers[3].forward(
-                        h,
-                        running_mean=running_means[3],
-                        running_var=running_vars[3],
-                        weight=weights[bn_params_start_idx+6],
-                        bias=weights[bn_params_start_idx+7],
-                        stats_id=bn_cond,
-                    )
-
-        # Fifth convolutional block
-        h = F.conv2d(h, weights[8], bias=weights[9], padding=1)
-        h = F.max_pool2d(h, kernel_size=2)
-        h = F.relu(h)
-
-        # Batch normalization
-        if self._use_batch_norm:
-            h = self._batchnorm_layers[4].forward(
-                        h,
-                        running_mean=running_means[4],
-                        running_var=running_vars[4],
-                        weight=weights[bn_params_start_idx+8],
-                        bias=weights[bn_params_start_idx+9],
-                        stats_id=bn_cond,
-                    )
-
-        ### Fully-connected layers
-        h = h.reshape(-1, weights[10].size()[1])
+        # Permuted HWC input already has the NHWC strides, so running
+        # convolutions in channels-last format does not need any copy
+        x = x.permute(0, 3, 1, 2).contiguous(memory_format=torch.channels_last)
+
+        with torch.autocast(
+            device_type="cuda",
+            dtype=torch.float16,
+            enabled=self._use_amp and x.is_cuda,
+        ):
+            ### Convolutional layers
+
+            # First convolutional block + pooling
+            h = self._conv_block(x, weights[0], weights[1], stride=2, pooling=True)
+
+            # Batch normalization
+            if self._use_batch_norm:
+                h = self._batchnorm_layers[0].forward(
+                            h,
+                            running_mean=running_means[0],
+                            running_var=running_vars[0],
+                            weight=weights[bn_params_start_idx],
+                            bias=weights[bn_params_start_idx+1],
+                            stats_id=bn_cond,
+                        )
+
+            # Second convolutional block
+            h = self._conv_block(h, weights[2], weights[3], pooling=True)
+
+            # Batch normalization
+            if self._use_batch_norm:
+                h = self._batchnorm_layers[1].forward(
+                            h,
+                            running_mean=running_means[1],
+                            running_var=running_vars[1],
+                            weight=weights[bn_params_start_idx+2],
+                            bias=weights[bn_params_start_idx+3],
+                            stats_id=bn_cond,
+                        )
+
+            # Third convolutional block
+            h = self._conv_block(h, weights[4], weights[5])
+
+            # Batch normalization
+            if self._use_batch_norm:
+                h = self._batchnorm_layers[2].forward(
+                            h,
+                            running_mean=running_means[2],
+                            running_var=running_vars[2],
+                            weight=weights[bn_params_start_idx+4],
+                            bias=weights[bn_params_start_idx+5],
+                            stats_id=bn_cond,
+                        )
+
+            # Fourth convolutional block
+            h = self._conv_block(h, weights[6], weights[7])
+
+            # Batch normalization
+            if self._use_batch_norm:
+                h = self._batchnorm_layers[3].forward(
+                            h,
+                            running_mean=running_means[3],
+                            running_var=running_vars[3],
+                            weight=weights[bn_params_start_idx+6],
+                            bias=weights[bn_params_start_idx+7],
+                            stats_id=bn_cond,
+                        )
+
+            # Fifth convolutional block
+            h = self._conv_block(h, weights[8], weights[9], pooling=True)
+
+            # Batch normalization
+            if self._use_batch_norm:
+                h = self._batchnorm_layers[4].forward(
+                            h,
+                            running_mean=running_means[4],
+                            running_var=running_vars[4],
+                            weight=weights[bn_params_start_idx+8],
+                            bias=weights[bn_params_start_idx+9],
+                            stats_id=bn_cond,
+                        )
+
+        ### Fully-connected layers (always in full precision)
+        h = h.float()
+        h = torch.flatten(h, start_dim=1)
+        assert h.shape[1] == weights[10].shape[1]
         
         # First fully-connected layer
-        h = F.linear(h, weights[10], bias=weights[11])
-        h = F.relu(h)
+        # ReLU works in place on the fresh output of the linear layer
+        h = F.relu_(F.linear(h, weights[10], bias=weights[11]))
 
         # Batch normalization
         if self._use_batch_norm:
@@ -340,8 +370,7 @@ class AlexNet(Classifier):
                     )
 
         # Second fully-connected layer
-        h = F.linear(h, weights[12], bias=weights[13])
-        h = F.relu(h)
+        h = F.relu_(F.linear(h, weights[12], bias=weights[13]))
 
         # Batch normalization
         if self._use_batch_norm:
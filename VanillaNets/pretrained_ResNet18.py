@@ -9,7 +9,7 @@ from hypnettorch.mnets.wide_resnet import WRN
 import torch
 import torch.nn as nn
 import math
-from torchvision.models import resnet18
+from torchvision.models import resnet18, ResNet18_Weights
 
 def conv3x3(in_planes, out_planes, stride=1):
     return nn.Conv2d(in_planes, out_planes, kernel_size=3, stride=stride, padding=1, bias=False)
@@ -107,6 +107,10 @@ class PretrainedResNet18(Classifier):
     ResNet-18 with weigths pretrained on ImageNet dataset. The weights are applied to a feature extractor part.
     However, a hypernetwork generates weights to a classification linear head.
     Right now, only images with input shape (224, 224, 3) are applicable.
+    If ``use_amp`` is set, the frozen feature extractor is evaluated in half
+    precision on CUDA devices. If ``chw_input_format`` is set, an unflattened
+    image batch with encoding ``CHW`` is expected instead of a flattened batch
+    with encoding ``HWC``.
     """
 
     def __init__(
@@ -116,6 +120,8 @@ class PretrainedResNet18(Classifier):
         no_weights=True,
         verbose=True,
         num_features=32,
+        use_amp=False,
+        chw_input_format=False,
         **kwargs
     ):
         super(PretrainedResNet18, self).__init__(num_classes, verbose)
@@ -124,8 +130,9 @@ class PretrainedResNet18(Classifier):
         assert in_shape == (224,224,3), "Please reshape your data!"
 
         # self.feature_extractor = resnet18(num_features=num_features, is_224=True)
-        self.feature_extractor = resnet18(pretrained=True)
-        self.feature_extractor = nn.Sequential(*list(self.feature_extractor.children())[:-1])
+        self.feature_extractor = resnet18(weights=ResNet18_Weights.IMAGENET1K_V1)
+        # The classification layer is replaced by the linear head below
+        self.feature_extractor.fc = nn.Identity()
 
         # # wget https://download.pytorch.org/models/resnet18-f37072fd.pth
         # state_dict = torch.load("/home/krukowsk/HINT/SavedModels/CUB200/resnet18-f37072fd.pth")
@@ -137,7 +144,14 @@ class PretrainedResNet18(Classifier):
         for param in self.feature_extractor.parameters():
             param.requires_grad_(False)
 
-        self._in_shape = (in_shape[2], in_shape[0], in_shape[1])
+        # Run the frozen backbone in channels-last format (NHWC kernels)
+        self.feature_extractor = self.feature_extractor.to(
+            memory_format=torch.channels_last
+        )
+
+        self._in_shape = in_shape
+        self._chw_input_format = chw_input_format
+        self._use_amp = use_amp
 
         self.linear_head = MLP(
             n_in=512,
@@ -175,11 +189,7 @@ class PretrainedResNet18(Classifier):
             (torch.Tensor): The output of the network.
         """
 
-        x = x.reshape((-1, *self._in_shape))
-        
-        # Forward pass through feature extractor
-        x = self.feature_extractor(x)
-        x = x.flatten(start_dim=1)
+        x = self.extract_features(x)
 
         # Forward pass through linear head
         x = self.linear_head.forward(x=x, weights=weights)
@@ -187,6 +197,42 @@ class PretrainedResNet18(Classifier):
         return x
     
 
+    def extract_features(self, x):
+        """Pass the input through the frozen feature extractor.
+
+        The features do not depend on weights generated by a hypernetwork,
+        therefore they may be computed once and fed to :attr:`linear_head`
+        with weights generated for consecutive tasks.
+
+        Parameters:
+        -----------
+            x: torch.Tensor
+                Input batch, as given to :meth:`forward`.
+
+        Returns:
+        --------
+            (torch.Tensor): Features of shape ``[batch_size, 512]``.
+        """
+        features = x
+        if not self._chw_input_format:
+            features = features.view(-1, *self._in_shape)
+            features = features.permute(0, 3, 1, 2)
+        # The backbone works in channels-last format; a permuted HWC batch
+        # already has such strides, hence no copy is done for it
+        features = features.contiguous(memory_format=torch.channels_last)
+
+        # Forward pass through feature extractor, in half precision if
+        # requested; the linear head always gets full precision features
+        with torch.autocast(
+            device_type="cuda",
+            dtype=torch.float16,
+            enabled=self._use_amp and features.is_cuda,
+        ):
+            features = self.feature_extractor(features)
+        features = features.float()
+
+        return features
+
     def distillation_targets(self):
         """Targets to be distilled after training.
 
@@ -12,16 +12,12 @@ from evaluation import (
 from Utils.handy_functions import reverse_predictions
 
 
-def translate_output_CIFAR_classes(labels, setup, task, mode):
+def get_CIFAR_classes_of_task(setup, task, mode):
     """
-    Translate labels of the form {0, 1, ..., N-1} to the real labels
-    of the CIFAR100 dataset.
+    Get real labels of the CIFAR100 / CIFAR10 dataset used in a selected task.
 
     Parameters:
     -----
-    labels: Union[np.ndarray, List[int]]
-        Contains labels of the form {0, 1, ..., N-1} where N is the number
-        of classes in a single task.
     setup: int
         Defines how many tasks were created in this training session.
     task: int
@@ -33,9 +29,9 @@ def translate_output_CIFAR_classes(labels, setup, task, mode):
 
     Returns:
     --------
-    np.ndarray
-        A numpy array of the same shape as `labels` but with proper
-        class labels.
+    List[int]
+        Real labels of consecutive classes of the task, i.e. the i-th entry
+        corresponds to the relative label i.
     """
     assert setup in [5, 6, 11, 21]
     assert mode in ["CIFAR100", "CIFAR10"]
@@ -88,22 +84,47 @@ def translate_output_CIFAR_classes(labels, setup, task, mode):
             (no_of_classes_per_task * task) : (no_of_classes_per_task * (task + 1))
         ]
 
+    return currently_used_classes
+
+
+def translate_output_CIFAR_classes(labels, setup, task, mode):
+    """
+    Translate labels of the form {0, 1, ..., N-1} to the real labels
+    of the CIFAR100 dataset.
+
+    Parameters:
+    -----
+    labels: Union[np.ndarray, List[int]]
+        Contains labels of the form {0, 1, ..., N-1} where N is the number
+        of classes in a single task.
+    setup: int
+        Defines how many tasks were created in this training session.
+    task: int
+        Number of the currently calculated task.
+    mode: str
+        Defines if the dataset is CIFAR100 or CIFAR10. Available values:
+        - "CIFAR100"
+        - "CIFAR10"
+
+    Returns:
+    --------
+    np.ndarray
+        A numpy array of the same shape as `labels` but with proper
+        class labels.
+    """
+    currently_used_classes = get_CIFAR_classes_of_task(setup, task, mode)
     y_translated = np.array(
         [currently_used_classes[i] for i in labels]
     )
     return y_translated
 
 
-def translate_output_MNIST_classes(relative_labels, task, mode):
+def get_MNIST_classes_of_task(task, mode):
     """
-    Translate relative labels of the form {0, 1} to the real labels
-    of the Split MNIST dataset.
+    Get real labels of the Permuted / Split MNIST dataset used in a selected task.
 
     Parameters:
     -----------
-    relative_labels: Union[np.ndarray, List[int]]
-        Contains labels of the form {0, 1} where 0 represents the first class
-        and 1 represents the second class.
     task: int
         Number of the currently calculated task (starting from 0).
     mode: str
@@ -112,9 +133,9 @@ def translate_output_MNIST_classes(relative_labels, task, mode):
 
     Returns:
     --------
-    np.ndarray
-        A numpy array of the same shape as `relative_labels` but with proper
-        class labels.
+    List[int]
+        Real labels of consecutive classes of the task, i.e. the i-th entry
+        corresponds to the relative label i.
     """
     assert mode in ["permuted", "split"]
 
@@ -133,11 +154,83 @@ def translate_output_MNIST_classes(relative_labels, task, mode):
         (no_of_classes_per_task * task) : (no_of_classes_per_task * (task + 1))
     ]
 
+    return currently_used_classes
+
+
+def translate_output_MNIST_classes(relative_labels, task, mode):
+    """
+    Translate relative labels of the form {0, 1} to the real labels
+    of the Split MNIST dataset.
+
+    Parameters:
+    -----------
+    relative_labels: Union[np.ndarray, List[int]]
+        Contains labels of the form {0, 1} where 0 represents the first class
+        and 1 represents the second class.
+    task: int
+        Number of the currently calculated task (starting from 0).
+    mode: str
+        Defines if the dataset is "permuted" or "split", depending on the desired
+        dataset.
+
+    Returns:
+    --------
+    np.ndarray
+        A numpy array of the same shape as `relative_labels` but with proper
+        class labels.
+    """
+    currently_used_classes = get_MNIST_classes_of_task(task, mode)
     y_translated = np.array(
         [currently_used_classes[i] for i in relative_labels]
     )
     return y_translated
 
+_TRANSLATION_LUTS = {}
+
+
+def build_translation_lut(setup, task_id, dataset, num_classes_per_task):
+    """
+    Build a lookup table translating relative classes {0, 1, ..., C-1}
+    of a selected task into absolute classes of the dataset. Tables are
+    cached per (dataset, setup, task, number of classes).
+
+    Parameters:
+    -----------
+    setup: int
+        Defines how many tasks were performed in this experiment (in total).
+    task_id: int
+        Number of the task for which the translation is prepared.
+    dataset: str
+        Name of the dataset for proper class translation.
+    num_classes_per_task: int
+        Number of output heads of the target network, i.e. C.
+
+    Returns:
+    --------
+    torch.LongTensor
+        A tensor of shape (C,) where the i-th entry is the absolute class
+        corresponding to the relative class i. Heads which are not used
+        by the task (e.g. in incremental CIFAR setups, where the first
+        task has more classes) are marked with -1.
+    """
+    key = (dataset, setup, task_id, num_classes_per_task)
+    if key not in _TRANSLATION_LUTS:
+        if dataset in ["CIFAR100_FeCAM_setup", "CIFAR10"]:
+            mode = "CIFAR100" if dataset == "CIFAR100_FeCAM_setup" else "CIFAR10"
+            absolute_classes = get_CIFAR_classes_of_task(setup, task_id, mode)
+        elif dataset in ["PermutedMNIST", "SplitMNIST"]:
+            mode = "permuted" if dataset == "PermutedMNIST" else "split"
+            absolute_classes = get_MNIST_classes_of_task(task_id, mode)
+        else:
+            raise ValueError("Wrong name of the dataset!")
+        absolute_classes = absolute_classes[:num_classes_per_task]
+        lut = torch.full((num_classes_per_task,), -1, dtype=torch.long)
+        lut[:len(absolute_classes)] = torch.as_tensor(
+            absolute_classes, dtype=torch.long
+        )
+        _TRANSLATION_LUTS[key] = lut
+    return _TRANSLATION_LUTS[key]
+
 def get_target_network_representation(
     hypernetwork,
     hypernetwork_weights,
@@ -165,9 +258,12 @@ def get_target_network_representation(
         Represents the target network architecture ("MLP" or "ResNet").
     input_data: torch.Tensor
         Input data for the network.
-    task: int
+    task: int or List[int]
         The considered task; the corresponding embedding and batch normalization
-        statistics will be used (if applicable)
+        statistics will be used (if applicable). For a list of tasks, weights
+        for all of them are generated with a single hypernetwork pass. The
+        list has to be of the form [0, 1, ..., K-1], as the hypernetwork
+        selects perturbation vectors by positions in the list.
     perturbated_eps: float
         Represents the taken perturbated epsilon.
     full_interval: bool
@@ -175,62 +271,150 @@ def get_target_network_representation(
 
     Returns:
     --------
-    torch.Tensor or list of torch.Tensor
-        A tensor (or list of tensors) representing lower, middle, and upper
-        values from the output classification layer.
+    torch.Tensor
+        A tensor representing lower, middle, and upper values from the output
+        classification layer. For a list of tasks, results for consecutive
+        tasks are stacked along an additional first dimension.
     """
     hypernetwork.eval()
     target_network.eval()
 
+    tasks = task if isinstance(task, list) else [task]
+    if isinstance(task, list):
+        assert tasks == list(range(len(tasks)))
+
     with torch.no_grad():
 
-        
+        # A single pass through the hypernetwork generates target weights
+        # for all the considered tasks; radii of intervals are not needed
+        # and are released immediately
         (
             lower_target_weights,
             middle_target_weights,
             upper_target_weights,
-            _
         ) = hypernetwork.forward(
             cond_id=task, 
             weights=hypernetwork_weights,
             perturbated_eps=perturbated_eps,
             return_extended_output=True
-        )
+        )[:3]
+        if len(tasks) == 1:
+            # For a single embedding, the hypernetwork does not return
+            # a batch of weight sets
+            lower_target_weights = [lower_target_weights]
+            middle_target_weights = [middle_target_weights]
+            upper_target_weights = [upper_target_weights]
+
+        all_logits = None
+        for i, current_task in enumerate(tasks):
+
+            if target_network_type in ["ResNet", "AlexNet"]:
+                condition = current_task
+            else:
+                condition = None
 
-        if target_network_type in ["ResNet", "AlexNet"]:
-                condition = task
-        else:
-            condition = None
-        
-        if full_interval:
+            if full_interval:
 
-            # Lower, middle and upper logits!
-            logits = target_network.forward(
-                                        input_data,
-                                        lower_weights=lower_target_weights,
-                                        middle_weights=middle_target_weights,
-                                        upper_weights=upper_target_weights,
-                                        condition=condition
-                                    )
-            logits = logits.rename(None)
-            
+                # Lower, middle and upper logits!
+                logits = target_network.forward(
+                                            input_data,
+                                            lower_weights=lower_target_weights[i],
+                                            middle_weights=middle_target_weights[i],
+                                            upper_weights=upper_target_weights[i],
+                                            condition=condition
+                                        )
+                logits = logits.rename(None)
 
-        else:
-            logits = torch.stack(reverse_predictions(
-                                    target_network,
-                                    input_data,
-                                    lower_target_weights,
-                                    middle_target_weights,
-                                    upper_target_weights,
-                                    condition
-                                ), dim=1)
-            
-        
-        
-        logits = logits.detach().cpu()
+            else:
+                logits = torch.stack(reverse_predictions(
+                                        target_network,
+                                        input_data,
+                                        lower_target_weights[i],
+                                        middle_target_weights[i],
+                                        upper_target_weights[i],
+                                        condition
+                                    ), dim=1)
+
+            if not isinstance(task, list):
+                all_logits = logits
+            else:
+                # The output tensor is allocated after the first task, when
+                # the shape of logits is known
+                if all_logits is None:
+                    all_logits = torch.empty(
+                        (len(tasks), *logits.shape),
+                        dtype=logits.dtype,
+                        device=logits.device,
+                    )
+                all_logits[i].copy_(logits)
+
+        # Logits stay on the device of the networks, so that entropy
+        # calculation is not serialized with host-device transfers
+        logits = all_logits.detach()
     
     return logits
 
+def capture_target_network_representation(
+    hypernetwork,
+    hypernetwork_weights,
+    target_network,
+    target_network_type,
+    static_input_data,
+    task,
+    perturbated_eps,
+    full_interval,
+    memory_pool=None
+):
+    """
+    Capture a CUDA graph with the generation of target network weights
+    by the hypernetwork and the forward pass of the target network for
+    a selected task. Replaying the graph avoids Python and kernel launch
+    overhead of `get_target_network_representation`.
+
+    Parameters:
+    -----------
+    (...): See docstring of `get_target_network_representation`.
+    static_input_data: torch.Tensor
+        Input data for the network. The graph always reads from this tensor,
+        therefore new data has to be copied into it before a replay.
+    memory_pool: optional
+        Memory pool shared with previously captured graphs (see
+        `torch.cuda.CUDAGraph.pool`). Graphs sharing a pool may overwrite
+        each other's static outputs, therefore the output of a graph has
+        to be consumed (e.g. copied) before any other graph from the pool
+        is replayed, and graphs must not be replayed concurrently.
+
+    Returns:
+    --------
+    Tuple[torch.cuda.CUDAGraph, torch.Tensor]
+        A tuple containing:
+        - graph: the captured CUDA graph.
+        - static_logits: a tensor of lower, middle, and upper logits
+          which is overwritten by each replay of the graph.
+    """
+    arguments = (
+        hypernetwork,
+        hypernetwork_weights,
+        target_network,
+        target_network_type,
+        static_input_data,
+        task,
+        perturbated_eps,
+        full_interval
+    )
+
+    # Warmup on a side stream is required before the capture
+    side_stream = torch.cuda.Stream()
+    side_stream.wait_stream(torch.cuda.current_stream())
+    with torch.cuda.stream(side_stream):
+        get_target_network_representation(*arguments)
+    torch.cuda.current_stream().wait_stream(side_stream)
+
+    graph = torch.cuda.CUDAGraph()
+    with torch.cuda.graph(graph, pool=memory_pool):
+        static_logits = get_target_network_representation(*arguments)
+    return graph, static_logits
+
 def extract_test_set_from_single_task(
     dataset_CL_tasks, no_of_task, dataset, device, mode="CIFAR100"
 ):
@@ -374,61 +558,56 @@ def get_task_and_class_prediction_based_on_logits(
         - predicted_tasks: torch.Tensor with the prediction of tasks for consecutive samples.
         - predicted_classes: torch.Tensor with the prediction of classes for consecutive samples.
           Positions of samples in the two tensors are the same.
+        Both tensors are placed on the same device as `inferenced_logits_of_all_tasks`.
     """
-    predicted_classes, predicted_tasks = [], []
-    number_of_samples = inferenced_logits_of_all_tasks.shape[1]
-
-    for no_of_sample in range(number_of_samples):
-        task_entropies = torch.zeros((inferenced_logits_of_all_tasks.shape[0]))
+    lower_logits, middle_logits, upper_logits = inferenced_logits_of_all_tasks.unbind(2)
 
-        all_task_single_output_sample = inferenced_logits_of_all_tasks[
-            :, no_of_sample, :, :
-        ]
-
-        # Calculate entropy based on results from all tasks
-        for no_of_inferred_task in range(task_entropies.shape[0]):
-
-            lower_logits = all_task_single_output_sample[no_of_inferred_task, 0, :]
-            upper_logits = all_task_single_output_sample[no_of_inferred_task, 2, :]
-            
-            softmaxed_inferred_task = F.softmax((lower_logits + upper_logits)/2.0, dim=-1)
+    # Calculate entropy based on results from all tasks for all samples
+    # at once. Shape of `task_entropies`: number of tasks x number of samples
+    centre_logits = (lower_logits + upper_logits) / 2.0
 
+    if not vanilla_entropy:
+        # Inverse widths of intervals, computed in place on a single buffer
+        factor = (upper_logits - lower_logits).add_(1e-8).abs_().reciprocal_()
 
-            if not vanilla_entropy:
-                factor = 1 /(upper_logits - lower_logits + 1e-8).abs()
+        assert not torch.isnan(factor).any()
 
-                assert not torch.isnan(factor).any()
-            else:
-                factor = 1.0
-            
-            task_entropies[no_of_inferred_task] = -1 * torch.sum(factor * \
-                softmaxed_inferred_task * torch.log(softmaxed_inferred_task), dim=-1
-            )
-        
-        selected_task_id = torch.argmin(task_entropies)
-        predicted_tasks.append(selected_task_id.item())
-
-        # We evaluate performance of classification task on middle
-        # logits only 
-        target_output = all_task_single_output_sample[selected_task_id.item(), 1, :]
-
-        output_relative_class = target_output.argmax().item()
+        log_softmaxed_inferred_tasks = F.log_softmax(centre_logits, dim=-1)
+        task_entropies = -1 * torch.sum(
+            factor * log_softmaxed_inferred_tasks.exp() * log_softmaxed_inferred_tasks,
+            dim=-1
+        )
+    else:
+        # H(p) = logsumexp(x) - sum(p * x), log-probabilities are not
+        # materialized at all
+        task_entropies = torch.logsumexp(centre_logits, dim=-1) - torch.sum(
+            F.softmax(centre_logits, dim=-1) * centre_logits, dim=-1
+        )
+    selected_task_ids = torch.argmin(task_entropies, dim=0)
+
+    # We evaluate performance of classification task on middle
+    # logits only
+    target_output = middle_logits.gather(
+        0,
+        selected_task_ids.view(1, -1, 1).expand(1, -1, middle_logits.shape[-1])
+    ).squeeze(0)
+    output_relative_classes = target_output.argmax(dim=-1)
+
+    # Translate relative classes into absolute ones with a single gather
+    # over lookup tables of all tasks (number of tasks x number of heads)
+    number_of_tasks, _, number_of_heads = middle_logits.shape
+    translation_luts = torch.stack(
+        [
+            build_translation_lut(setup, task_id, dataset, number_of_heads)
+            for task_id in range(number_of_tasks)
+        ]
+    ).to(middle_logits.device)
+    predicted_classes = translation_luts[selected_task_ids, output_relative_classes]
 
-        if dataset in ["CIFAR100_FeCAM_setup", "CIFAR10"]:
-            mode = "CIFAR100" if dataset == "CIFAR100_FeCAM_setup" else "CIFAR10"
-            output_absolute_class = translate_output_CIFAR_classes(
-                [output_relative_class], setup, selected_task_id.item(), mode=mode
-            )
-        elif dataset in ["PermutedMNIST", "SplitMNIST"]:
-            mode = "permuted" if dataset == "PermutedMNIST" else "split"
-            output_absolute_class = translate_output_MNIST_classes(
-                [output_relative_class], selected_task_id.item(), mode=mode
-            )
-        else:
-            raise ValueError("Wrong name of the dataset!")
-        predicted_classes.append(output_absolute_class)
-    predicted_tasks = torch.tensor(predicted_tasks, dtype=torch.int32)
-    predicted_classes = torch.tensor(predicted_classes, dtype=torch.int32)
+    # Predictions stay on the device of logits, so the caller decides
+    # when to synchronize with the host
+    predicted_tasks = selected_task_ids.to(torch.int32)
+    predicted_classes = predicted_classes.to(torch.int32)
     return predicted_tasks, predicted_classes
 
 
@@ -464,10 +643,27 @@ def calculate_entropy_and_predict_classes_separately(experiment_models):
     alpha = hyperparameters["alpha"]
     full_interval = hyperparameters["full_interval"]
     vanilla_entropy = experiment_models["vanilla_entropy"]
+    use_cuda_graphs = hyperparameters["use_cuda_graphs"]
 
     hypernetwork.eval()
     target_network.eval()
 
+    # CUDA graphs (one per inferenced task and batch size) are captured once
+    # and replayed for test sets of consecutive tasks. Test sets are padded
+    # with zeros to the size of the largest one, so a single set of graphs
+    # serves all tasks. Padding is not possible when batch normalization
+    # uses statistics of the current batch, then graphs are reused only
+    # for test sets of equal sizes.
+    cuda_graphs, static_inputs, memory_pool = {}, {}, None
+    pad_test_sets = not (
+        getattr(target_network, "_use_batch_norm", False)
+        and not getattr(target_network, "_bn_track_stats", True)
+    )
+    max_test_set_size = max(
+        dataset_CL_tasks[t].num_test_samples
+        for t in range(hyperparameters["number_of_tasks"])
+    )
+
     results = []
     for task in range(hyperparameters["number_of_tasks"]):
 
@@ -475,29 +671,96 @@ def calculate_entropy_and_predict_classes_separately(experiment_models):
             dataset_CL_tasks, task, dataset_name, hyperparameters["device"]
         )
 
-        with torch.no_grad():
-            logits_outputs_for_different_tasks = []
-            for inferenced_task in range(hyperparameters["number_of_tasks"]):
+        replay_cuda_graphs = use_cuda_graphs and X_test.is_cuda
+        if replay_cuda_graphs:
+            number_of_samples = X_test.shape[0]
+            batch_size = max_test_set_size if pad_test_sets \
+                else number_of_samples
+            if batch_size not in static_inputs:
+                static_inputs[batch_size] = torch.zeros(
+                    (batch_size, *X_test.shape[1:]),
+                    dtype=X_test.dtype,
+                    device=X_test.device,
+                )
+            static_X_test = static_inputs[batch_size]
+            static_X_test[:number_of_samples].copy_(X_test)
+            static_X_test[number_of_samples:].zero_()
 
-                # Try to predict task for all samples from "task"
-                logits = get_target_network_representation(
+        with torch.no_grad():
+            # Sizes of consecutive dimensions represent:
+            # number of tasks x number of samples x 3 x number of output heads
+            if replay_cuda_graphs:
+                # The tensor is allocated after the first inferenced task,
+                # when the shape of logits is known.
+                all_inferenced_tasks = None
+                for inferenced_task in range(hyperparameters["number_of_tasks"]):
+
+                    # Try to predict task for all samples from "task"
+                    graph_key = (batch_size, inferenced_task)
+                    if graph_key not in cuda_graphs:
+                        cuda_graphs[graph_key] = \
+                            capture_target_network_representation(
+                                hypernetwork,
+                                hypernetwork_weights,
+                                target_network,
+                                target_network_type,
+                                static_X_test,
+                                inferenced_task,
+                                alpha,
+                                full_interval,
+                                memory_pool=memory_pool
+                            )
+                        if memory_pool is None:
+                            memory_pool = cuda_graphs[graph_key][0].pool()
+                    graph, logits = cuda_graphs[graph_key]
+                    graph.replay()
+                    # Outputs for padding samples are dropped
+                    logits = logits[:number_of_samples]
+
+                    if all_inferenced_tasks is None:
+                        all_inferenced_tasks = torch.empty(
+                            (hyperparameters["number_of_tasks"], *logits.shape),
+                            dtype=logits.dtype,
+                            device=logits.device,
+                        )
+                    all_inferenced_tasks[inferenced_task].copy_(logits)
+            elif hyperparameters["generate_weights_for_all_tasks"]:
+                # Try to predict task for all samples from "task", target
+                # weights of all inferenced tasks are generated at once.
+                # Memory of generated weights grows with the number of tasks.
+                all_inferenced_tasks = get_target_network_representation(
                     hypernetwork,
                     hypernetwork_weights,
                     target_network,
                     target_network_type,
                     X_test,
-                    inferenced_task,
+                    list(range(hyperparameters["number_of_tasks"])),
                     alpha,
                     full_interval
                 )
-
-                logits_outputs_for_different_tasks.append(logits)
-
-            all_inferenced_tasks = torch.stack(
-                logits_outputs_for_different_tasks
-            )
-            # Sizes of consecutive dimensions represent:
-            # number of tasks x number of samples x 3 x number of output heads
+            else:
+                all_inferenced_tasks = None
+                for inferenced_task in range(hyperparameters["number_of_tasks"]):
+
+                    # Try to predict task for all samples from "task"
+                    logits = get_target_network_representation(
+                        hypernetwork,
+                        hypernetwork_weights,
+                        target_network,
+                        target_network_type,
+                        X_test,
+                        inferenced_task,
+                        alpha,
+                        full_interval
+                    )
+
+                    if all_inferenced_tasks is None:
+                        all_inferenced_tasks = torch.empty(
+                            (hyperparameters["number_of_tasks"], *logits.shape),
+                            dtype=logits.dtype,
+                            device=logits.device,
+                        )
+                    all_inferenced_tasks[inferenced_task].copy_(logits)
         (
             predicted_tasks,
             predicted_classes,
@@ -507,12 +770,16 @@ def calculate_entropy_and_predict_classes_separately(experiment_models):
             dataset_name,
             vanilla_entropy=vanilla_entropy
         )
-        predicted_classes = predicted_classes.flatten().numpy()
+        # Logits of all inferenced tasks may take a lot of GPU memory,
+        # so they are released before the next task is processed
+        del all_inferenced_tasks
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
         task_prediction_accuracy = (
-            torch.sum(predicted_tasks == task).float()
-            * 100.0
-            / predicted_tasks.shape[0]
-        ).item()
+            (predicted_tasks == task).float().mean().mul_(100.0).item()
+        )
+        predicted_classes = predicted_classes.cpu().numpy()
         print(f"task prediction accuracy: {task_prediction_accuracy}")
         sample_prediction_accuracy = (
             np.sum(predicted_classes == y_test) * 100.0 / y_test.shape[0]
@@ -535,6 +802,7 @@ if __name__ == "__main__":
     # alphas = np.linspace(0.01, 0.5, 5)
     alphas = [0.1]
     vanilla_entropy = False
+    use_cuda_graphs = False
 
     # Options for *dataset*:
     # 'PermutedMNIST', 'SplitMNIST', 'CIFAR100_FeCAM_setup', 'CIFAR10'
@@ -567,34 +835,31 @@ if __name__ == "__main__":
             experiment_models["hyperparameters"]["saving_folder"] = path_to_save
             experiment_models["hyperparameters"]["alpha"] = alpha
             experiment_models["vanilla_entropy"] = vanilla_entropy
+            experiment_models["hyperparameters"]["use_cuda_graphs"] = use_cuda_graphs
 
             results = calculate_entropy_and_predict_classes_separately(
                 experiment_models
             )
             results_summary.append(results)
             
-        data_statistics = []
-        for summary in results_summary:
-            data_statistics.append(
-                [
-                    list(summary["task_prediction_acc"].values),
-                    list(summary["class_prediction_acc"].values),
-                    np.mean(summary["task_prediction_acc"].values),
-                    np.std(summary["task_prediction_acc"].values),
-                    np.mean(summary["class_prediction_acc"].values),
-                    np.std(summary["class_prediction_acc"].values),
-                ]
-            )
-        column_names = [
-            "task_prediction_accuracy",
-            "class_prediction_accuracy",
-            "mean_task_prediction_accuracy",
-            "std_dev_task_prediction_accuracy",
-            "mean_class_prediction_accuracy",
-            "std_dev_class_prediction_accuracy",
-        ]
-        table_to_save = data_statistics
-        dataframe = pd.DataFrame(table_to_save, columns=column_names)
+        # Statistics for consecutive models (population standard deviation,
+        # like np.std)
+        combined_summary = pd.concat(
+            results_summary, keys=range(len(results_summary))
+        ).groupby(level=0)[["task_prediction_acc", "class_prediction_acc"]]
+        accuracies = combined_summary.agg(list)
+        means = combined_summary.mean()
+        std_devs = combined_summary.std(ddof=0)
+        dataframe = pd.DataFrame(
+            {
+                "task_prediction_accuracy": accuracies["task_prediction_acc"],
+                "class_prediction_accuracy": accuracies["class_prediction_acc"],
+                "mean_task_prediction_accuracy": means["task_prediction_acc"],
+                "std_dev_task_prediction_accuracy": std_devs["task_prediction_acc"],
+                "mean_class_prediction_accuracy": means["class_prediction_acc"],
+                "std_dev_class_prediction_accuracy": std_devs["class_prediction_acc"],
+            }
+        )
         dataframe.to_csv(
             f"{path_to_save}entropy_mean_results",
             sep=";",
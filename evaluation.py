@@ -187,7 +187,9 @@ def prepare_target_network(hyperparameters, output_shape):
             no_weights=True,
             use_batch_norm=hyperparameters["use_batch_norm"],
             bn_track_stats=False,
-            distill_bn_stats=False
+            distill_bn_stats=False,
+            use_torch_compile=hyperparameters["use_torch_compile"],
+            use_amp=hyperparameters["use_amp"]
         ).to(hyperparameters["device"])
 
     else: